@@ -1,39 +1,179 @@
+import argparse
 import asyncio
+import os
+import sys
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from playwright.async_api import async_playwright
 import subprocess
-import re
-from urllib.parse import urlparse, unquote
+import shutil
+import struct
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_EXCEPTION
+from urllib.parse import urlparse, unquote, urljoin
 import m3u8
 
+# Read size for streamed downloads; throughput plateaus well below 1 MiB, and smaller
+# chunks keep the live buffer per parallel worker small
+CHUNK_SIZE = 64 * 1024
+# Parallel segment fetches; more connections than this tends to get throttled by CDNs
+HLS_WORKERS = 6
+# Concurrent ffprobe/playlist lookups when listing captured videos
+PROBE_WORKERS = 8
+# Parallel byte-range downloads of a single mp4, and the size below which one stream is enough
+RANGE_WORKERS = 4
+MIN_RANGED_SIZE = 8 * 1024 * 1024
+# Playlists are small text files; anything larger is not worth parsing
+MAX_PLAYLIST_BYTES = 1 << 20
+# Enough of an mp4 to reach moov/mvhd when the file is faststart-ed
+MP4_PROBE_BYTES = 64 * 1024
+
+# Upper bound on waiting for the first video request, then a short window to collect siblings
+VIDEO_WAIT_TIMEOUT = 25
+VIDEO_GRACE_PERIOD = 3
+# Resources that can't be the video; skipping them lets the page get to its player sooner.
+# Stylesheets are still loaded so consent/play buttons keep their real visibility for clicking.
+SKIPPED_RESOURCE_TYPES = ("image", "font", "media")
+
+# Characters Windows forbids in filenames, mapped to "_" for str.translate
+INVALID_FILENAME_CHARS = str.maketrans({c: "_" for c in '\\/*?:"<>|'})
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/117.0.0.0 Safari/537.36",
+}
+
+# One pooled keep-alive session for every request, so segments don't each pay a TLS handshake
+SESSION = requests.Session()
+SESSION.headers.update(DEFAULT_HEADERS)
+adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16,
+                      max_retries=Retry(total=3, backoff_factor=0.3))
+SESSION.mount("https://", adapter)
+SESSION.mount("http://", adapter)
+
 def sanitize_filename(filename: str, fallback_prefix="video") -> str:
     """Remove invalid characters for Windows filenames and add fallback if needed."""
-    cleaned = re.sub(r'[\\/*?:"<>|]', "_", filename).strip()
+    cleaned = filename.translate(INVALID_FILENAME_CHARS).strip()
     if not cleaned or cleaned.startswith("."):
         cleaned = f"{fallback_prefix}.mp4"
     return cleaned
 
 def unique_filename(base: str) -> str:
     """Ensure filename is unique by appending counter if needed."""
-    base_path = Path(base)
-    if not base_path.exists():
-        return str(base_path)
-    stem, suffix = base_path.stem, base_path.suffix
+    if not os.path.exists(base):
+        return base
+    stem, suffix = os.path.splitext(base)
     counter = 1
-    while True:
-        new_name = f"{stem}_{counter}{suffix}"
-        new_path = base_path.with_name(new_name)
-        if not new_path.exists():
-            return str(new_path)
+    while os.path.exists(candidate := f"{stem}_{counter}{suffix}"):
         counter += 1
+    return candidate
+
+def preallocate(fd, size):
+    """Reserve disk space up front so the filesystem can lay the file out contiguously"""
+    try:
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(fd, 0, size)
+        else:
+            os.ftruncate(fd, size)
+    except OSError:
+        pass
 
-def download_with_requests(url, filename=None, chunk_size=1024*1024):
-    """Download direct .mp4 via requests with progress"""
+def open_for_writing(path):
+    """Open an unbuffered fd for streaming writes, hinting sequential access where supported"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    return fd
+
+def write_all(fd, data):
+    """os.write may accept only part of a buffer; keep going until all of it is written"""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+def print_progress(downloaded, total_size, total_mb):
+    if total_size:
+        sys.stdout.write(f"\rProgress: {downloaded * 100 / total_size:.2f}%  ({downloaded / 1e6:,.1f} / {total_mb:,.1f} MB)")
+    else:
+        sys.stdout.write(f"\rDownloaded: {downloaded / 1e6:,.1f} MB (total unknown)")
+    sys.stdout.flush()
+
+def get_ranged_size(url, headers):
+    """Return the file size if the server accepts byte ranges and it is big enough to split, else None"""
+    try:
+        r = SESSION.head(url, headers=headers, allow_redirects=True, timeout=15)
+    except requests.RequestException:
+        return None
+    total_size = int(r.headers.get("content-length", 0))
+    if (r.ok and r.headers.get("accept-ranges", "").lower() == "bytes"
+            and "content-encoding" not in r.headers and total_size >= MIN_RANGED_SIZE):
+        return total_size
+    return None
+
+def download_ranges(url, headers, filepath, total_size, chunk_size):
+    """Download a file as parallel byte ranges, each worker writing its own slice of a preallocated file"""
+    fd = open_for_writing(filepath)
+    try:
+        preallocate(fd, total_size)
+    finally:
+        os.close(fd)
+    part_size = -(-total_size // RANGE_WORKERS)
+    ranges = [(start, min(start + part_size, total_size) - 1) for start in range(0, total_size, part_size)]
+    downloaded = 0
+    lock = threading.Lock()
+    failed = threading.Event()
+
+    def fetch_range(start, end):
+        nonlocal downloaded
+        range_headers = {**headers, "Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"}
+        with SESSION.get(url, headers=range_headers, stream=True, timeout=15) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise RuntimeError("server ignored the Range header")
+            # A separate fd per worker keeps its own file offset, so no pwrite is needed (not on Windows)
+            fd = os.open(filepath, os.O_WRONLY | getattr(os, "O_BINARY", 0))
+            try:
+                os.lseek(fd, start, os.SEEK_SET)
+                remaining = end - start + 1
+                while remaining > 0 and not failed.is_set():
+                    chunk = response.raw.read(min(chunk_size, remaining))
+                    if not chunk:
+                        raise RuntimeError(f"bytes {start}-{end} ended early")
+                    write_all(fd, chunk)
+                    remaining -= len(chunk)
+                    with lock:
+                        downloaded += len(chunk)
+            finally:
+                os.close(fd)
+
+    total_mb = total_size / 1e6
+    try:
+        with ThreadPoolExecutor(max_workers=RANGE_WORKERS) as executor:
+            pending = [executor.submit(fetch_range, start, end) for start, end in ranges]
+            try:
+                while pending:
+                    done, pending = wait(pending, timeout=0.1, return_when=FIRST_EXCEPTION)
+                    print_progress(downloaded, total_size, total_mb)
+                    for future in done:
+                        if future.exception():
+                            raise future.exception()
+            except BaseException:
+                # Stop the other workers (also on Ctrl-C) before the executor waits on them
+                failed.set()
+                raise
+    except BaseException:
+        # The file is already full size, so a partial one would look complete
+        filepath.unlink(missing_ok=True)
+        raise
+
+def download_with_requests(url, filename=None, chunk_size=CHUNK_SIZE):
+    """Download direct .mp4 via requests with progress, in parallel byte ranges when the server supports it"""
     headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                      "AppleWebKit/537.36 (KHTML, like Gecko) "
-                      "Chrome/117.0.0.0 Safari/537.36",
         "Referer": url,
         "Accept": "video/mp4,video/*;q=0.9,*/*;q=0.8",
     }
@@ -44,44 +184,178 @@ def download_with_requests(url, filename=None, chunk_size=1024*1024):
     filename = unique_filename(filename)
     filepath = Path(filename).resolve()
     try:
-        with requests.get(url, headers=headers, stream=True, timeout=15) as response:
-            response.raise_for_status()
-            total_size = int(response.headers.get("content-length", 0))
-            downloaded = 0
-            with open(filepath, "wb") as f:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        f.write(chunk)
+        total_size = get_ranged_size(url, headers)
+        if total_size:
+            print(f"Server accepts byte ranges, downloading in {RANGE_WORKERS} parallel parts")
+            download_ranges(url, headers, filepath, total_size, chunk_size)
+        else:
+            with SESSION.get(url, headers=headers, stream=True, timeout=15) as response:
+                response.raise_for_status()
+                total_size = int(response.headers.get("content-length", 0))
+                downloaded = 0
+                # Read straight from the urllib3 stream; only decode if the server compressed it
+                response.raw.decode_content = "content-encoding" in response.headers
+                total_mb = total_size / 1e6
+                last_print = 0.0
+                # Write chunks straight to the fd: one syscall each, no BufferedWriter copy
+                fd = open_for_writing(filepath)
+                try:
+                    # content-length is the compressed size when decoding, so only reserve for raw bodies
+                    if total_size and not response.raw.decode_content:
+                        preallocate(fd, total_size)
+                    while True:
+                        chunk = response.raw.read(chunk_size)
+                        if not chunk:
+                            break
+                        write_all(fd, chunk)
                         downloaded += len(chunk)
-                        percent = downloaded * 100 / total_size if total_size else 0
-                        print(f"\rProgress: {percent:.2f}%", end="")
+                        now = time.monotonic()
+                        if now - last_print > 0.1:
+                            print_progress(downloaded, total_size, total_mb)
+                            last_print = now
+                finally:
+                    # Drop any reserved space the server didn't actually fill, even if the read failed,
+                    # so an interrupted download stays visibly short
+                    os.ftruncate(fd, downloaded)
+                    os.close(fd)
+                print_progress(downloaded, total_size, total_mb)
         print(f"\nDownload completed ✅ Saved as: {filepath.name}")
         return filepath
     except Exception as e:
         print(f"\nError downloading video: {e}")
         return None
 
-def download_m3u8(m3u8_url, filename):
-    """Download HLS stream via ffmpeg"""
+def download_segment(url, path, chunk_size=CHUNK_SIZE):
+    """Stream a single HLS segment to disk"""
+    with SESSION.get(url, stream=True, timeout=15) as response:
+        response.raise_for_status()
+        response.raw.decode_content = "content-encoding" in response.headers
+        with open(path, "wb") as f:
+            while True:
+                chunk = response.raw.read(chunk_size)
+                if not chunk:
+                    break
+                f.write(chunk)
+    return path
+
+def fetch_playlist(url):
+    """Fetch and parse an m3u8 playlist, decoding the body directly instead of via response.text.
+    Returns (playlist, final_url); relative URIs in it resolve against final_url, which follows redirects."""
+    with SESSION.get(url, stream=True, timeout=10) as r:
+        r.raise_for_status()
+        # Read one byte past the cap so an oversized body is rejected rather than parsed truncated
+        body = r.raw.read(MAX_PLAYLIST_BYTES + 1, decode_content=True)
+    if len(body) > MAX_PLAYLIST_BYTES:
+        raise ValueError(f"playlist larger than {MAX_PLAYLIST_BYTES} bytes: {url}")
+    return m3u8.loads(body.decode("utf-8", "replace")), r.url
+
+def segments_fetchable(playlist):
+    """Only finished, unencrypted MPEG-TS playlists with one file per segment can be fetched and concatenated as-is"""
+    if not playlist.is_endlist or not playlist.segments:
+        return False
+    if any(key is not None and key.method != "NONE" for key in playlist.keys):
+        return False
+    # EXT-X-BYTERANGE segments are slices of a shared file, a plain GET would fetch all of it each time
+    return not any(seg.init_section or seg.byterange for seg in playlist.segments)
+
+def remux_segments(tmpdir, paths, filename):
+    """Concatenate downloaded segments into an mp4 via ffmpeg, then remove the segments"""
+    try:
+        # Segments were written in playlist order, so a plain concat + remux is enough
+        list_path = tmpdir / "filelist.txt"
+        with open(list_path, "w") as f:
+            f.writelines(f"file '{path.name}'\n" for path in paths)
+        cmd = ["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", str(list_path),
+               "-c", "copy", "-movflags", "+faststart", str(filename)]
+        subprocess.run(cmd, check=True)
+    except Exception as e:
+        # Drop the reserved/partial output, but keep what was downloaded
+        filename.unlink(missing_ok=True)
+        print(f"\nError remuxing {filename.name}: {e}, segments kept in {tmpdir}")
+        return None
+    shutil.rmtree(tmpdir, ignore_errors=True)
+    print(f"\nDownload completed ✅ Saved as: {filename.name}")
+    return filename
+
+def select_variant(playlists, max_bitrate=None, max_height=None):
+    """Pick the highest resolution variant, or with limits given, the highest bitrate one that fits them"""
+    if max_bitrate is None and max_height is None:
+        return max(playlists, key=lambda p: (p.stream_info.resolution or (0,0)))
+    candidates = [p for p in playlists
+                  if (max_bitrate is None or (p.stream_info.bandwidth or 0) <= max_bitrate)
+                  and (max_height is None or (p.stream_info.resolution or (0,0))[1] <= max_height)]
+    if not candidates:
+        # Nothing fits, the smallest stream is the closest we can get
+        return min(playlists, key=lambda p: p.stream_info.bandwidth or 0)
+    return max(candidates, key=lambda p: p.stream_info.bandwidth or 0)
+
+def download_m3u8(m3u8_url, filename, playlist=None, remux_executor=None, max_bitrate=None, max_height=None):
+    """Download HLS stream via parallel segment fetches and an ffmpeg remux, run on remux_executor if given"""
     filename = sanitize_filename(filename)
     filename = unique_filename(filename)
     filename = Path(filename).with_suffix(".mp4").resolve()
 
-    # Get highest resolution from m3u8 master playlist
+    # Pick a variant from the m3u8 master playlist (capped by max_bitrate in bits/s and max_height),
+    # then its media playlist. A (playlist, final_url) pair from fetch_playlist skips fetching it again.
     try:
-        r = requests.get(m3u8_url)
-        master = m3u8.loads(r.text)
-        if master.is_variant:
-            best = max(master.playlists, key=lambda p: (p.stream_info.resolution or (0,0)))
-            m3u8_url = best.uri
-            print(f"Selected highest resolution stream: {best.stream_info.resolution}")
+        playlist, m3u8_url = playlist or fetch_playlist(m3u8_url)
+        if playlist.is_variant:
+            best = select_variant(playlist.playlists, max_bitrate, max_height)
+            m3u8_url = urljoin(m3u8_url, best.uri)
+            print(f"Selected stream: {best.stream_info.resolution} @ {best.stream_info.bandwidth} bps")
+            playlist, m3u8_url = fetch_playlist(m3u8_url)
     except Exception as e:
         print(f"Could not parse m3u8 for resolutions: {e}")
+        playlist = None
+
+    if playlist is None or not segments_fetchable(playlist):
+        # Live, encrypted, fMP4 or byte-range streams: let ffmpeg handle the whole thing
+        print(f"Downloading HLS stream via ffmpeg to {filename}")
+        cmd = ["ffmpeg", "-y", "-i", m3u8_url, "-c", "copy", "-movflags", "+faststart", str(filename)]
+        try:
+            subprocess.run(cmd, check=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"Error downloading HLS stream: {e}")
+            return None
+        print("Download completed ✅")
+        return filename
 
-    print(f"Downloading HLS stream via ffmpeg to {filename}")
-    cmd = ["ffmpeg", "-y", "-i", m3u8_url, "-c", "copy", str(filename)]
-    subprocess.run(cmd)
-    print("Download completed ✅")
+    segment_urls = [urljoin(m3u8_url, seg.uri) for seg in playlist.segments]
+    total = len(segment_urls)
+    print(f"Downloading {total} segments ({HLS_WORKERS} at a time) to {filename}")
+    # Reserve the name now: a background remux may not have created it before the next download picks one
+    filename.touch()
+    # Keep segments next to the output rather than in /tmp, which may be RAM-backed
+    tmpdir = Path(tempfile.mkdtemp(prefix="hls_", dir=filename.parent))
+    paths = [tmpdir / f"{i:05d}.ts" for i in range(total)]
+    try:
+        with ThreadPoolExecutor(max_workers=HLS_WORKERS) as executor:
+            futures = [executor.submit(download_segment, url, path) for url, path in zip(segment_urls, paths)]
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    future.result()
+                    print(f"\rSegments: {done}/{total}", end="")
+            except BaseException:
+                # Drop the queued segments so a failure or Ctrl-C doesn't fetch the rest of the stream
+                executor.shutdown(cancel_futures=True)
+                raise
+    except KeyboardInterrupt:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        filename.unlink(missing_ok=True)
+        raise
+    except Exception as e:
+        print(f"\nError downloading segment: {e}")
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        filename.unlink(missing_ok=True)
+        return None
+
+    if remux_executor is None:
+        print("\nRemuxing segments via ffmpeg...")
+        return remux_segments(tmpdir, paths, filename)
+    # The remux reports its own outcome; the caller waits on remux_executor before exiting
+    print("\nRemuxing segments via ffmpeg in the background...")
+    remux_executor.submit(remux_segments, tmpdir, paths, filename)
+    return filename
 
 def get_video_duration(url):
     """Get video duration in seconds using ffprobe"""
@@ -98,6 +372,72 @@ def get_video_duration(url):
         pass
     return None
 
+def find_box(data, box_type, start=0, end=None):
+    """Find an ISO-BMFF box among the boxes in data[start:end], return (payload_start, box_end) or None"""
+    end = len(data) if end is None else min(end, len(data))
+    pos = start
+    while pos + 8 <= end:
+        size, kind = struct.unpack_from(">I4s", data, pos)
+        header = 8
+        if size == 1:
+            if pos + 16 > end:
+                return None
+            size = struct.unpack_from(">Q", data, pos + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header:
+            return None
+        if kind == box_type:
+            return pos + header, pos + size
+        pos += size
+    return None
+
+def get_mp4_duration(url):
+    """Get mp4 duration in seconds from the moov/mvhd box, using a ranged GET of the file header"""
+    try:
+        headers = {"Range": f"bytes=0-{MP4_PROBE_BYTES - 1}"}
+        with SESSION.get(url, headers=headers, stream=True, timeout=10) as r:
+            r.raise_for_status()
+            data = r.raw.read(MP4_PROBE_BYTES, decode_content=True)
+        moov = find_box(data, b"moov")
+        mvhd = find_box(data, b"mvhd", *moov) if moov else None
+        if mvhd is None:
+            return None
+        pos = mvhd[0]
+        # version 1 uses 64-bit times: creation, modification, timescale, duration
+        if data[pos] == 1:
+            timescale, duration = struct.unpack_from(">IQ", data, pos + 20)
+        else:
+            timescale, duration = struct.unpack_from(">II", data, pos + 12)
+        return duration / timescale if timescale else None
+    except Exception:
+        return None
+
+def probe_duration(url, playlists=None):
+    """Get duration in seconds for a captured .mp4 or .m3u8 URL,
+    keeping parsed playlists in the optional playlists dict for later download"""
+    if url.endswith(".mp4"):
+        # Only spawn ffprobe when moov isn't at the start of the file
+        return get_mp4_duration(url) or get_video_duration(url)
+    if url.endswith(".m3u8"):
+        # Try to get duration from m3u8 playlist
+        try:
+            m, final_url = fetch_playlist(url)
+            if playlists is not None:
+                playlists[url] = (m, final_url)
+            return sum([seg.duration for seg in m.segments]) if m.segments else None
+        except:
+            pass
+    return None
+
+def positive_int(value):
+    """argparse type for limits that only make sense above zero"""
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value}")
+    return number
+
 async def capture_video_url(page_url):
     """
     Use headed Playwright to capture all .mp4 or .m3u8 URLs,
@@ -108,27 +448,28 @@ async def capture_video_url(page_url):
         browser = await p.chromium.launch(headless=False)
         context = await browser.new_context()
         video_urls = []
-        page_title = None
+        video_found = asyncio.Event()
 
         async def handle_route(route):
             url = route.request.url
-            if re.search(r"\.mp4|\.m3u8", url):
+            if ".mp4" in url or ".m3u8" in url:
                 if url not in video_urls:
                     video_urls.append(url)
+                    video_found.set()
+            elif route.request.resource_type in SKIPPED_RESOURCE_TYPES:
+                await route.abort()
+                return
             await route.continue_()
 
         page = await context.new_page()
         await context.route("**/*", handle_route)
         await page.goto(page_url)
-        print("Page loaded. Attempting to close popups automatically...")
-
-        # Grab page title
+        # Give late-rendered consent dialogs a moment to appear, without waiting on endless players
         try:
-            page_title = await page.title()
-            if page_title:
-                page_title = sanitize_filename(page_title.strip()) + ".mp4"
+            await page.wait_for_load_state("networkidle", timeout=5000)
         except:
             pass
+        print("Page loaded. Attempting to close popups automatically...")
 
         # Auto-click common popup/consent/play buttons
         popup_selectors = [
@@ -137,21 +478,43 @@ async def capture_video_url(page_url):
             'button:has-text("Close")',
             'button:has-text("Play")',
         ]
-        for selector in popup_selectors:
+
+        async def handle_popups():
+            # One union query instead of a browser round-trip per selector
             try:
-                element = await page.query_selector(selector)
-                if element:
-                    await element.click()
-                    print(f"Clicked popup: {selector}")
+                elements = await page.locator(", ".join(popup_selectors)).all()
             except:
-                pass
+                elements = []
+            for element in elements:
+                try:
+                    await element.click(timeout=500)
+                    print("Clicked popup button")
+                except:
+                    pass
+
+        # Grab page title while the popups are handled, rather than as a separate round-trip
+        page_title, _ = await asyncio.gather(page.title(), handle_popups(), return_exceptions=True)
+        if isinstance(page_title, str) and page_title.strip():
+            page_title = sanitize_filename(page_title.strip()) + ".mp4"
+        else:
+            page_title = None
 
         print("Waiting for video requests to fire...")
-        await asyncio.sleep(25)
+        try:
+            await asyncio.wait_for(video_found.wait(), timeout=VIDEO_WAIT_TIMEOUT)
+            await asyncio.sleep(VIDEO_GRACE_PERIOD)
+        except asyncio.TimeoutError:
+            pass
         await browser.close()
         return video_urls, page_title
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Capture and download .mp4/.m3u8 videos from a web page.")
+    parser.add_argument("--max-bitrate", type=positive_int, default=None, help="Highest HLS variant bitrate to pick, in kbit/s (default: no limit)")
+    parser.add_argument("--max-height", type=positive_int, default=None, help="Highest HLS variant height to pick, e.g. 720 (default: no limit)")
+    args = parser.parse_args()
+    max_bitrate = args.max_bitrate * 1000 if args.max_bitrate is not None else None
+
     page_url = input("Enter the video page URL: ").strip()
     if not page_url:
         print("No URL provided.")
@@ -163,21 +526,12 @@ if __name__ == "__main__":
         print("Failed to capture video URLs automatically.")
         exit()
 
-    # Gather info for user
-    videos_info = []
-    for idx, url in enumerate(video_urls, 1):
-        duration = None
-        if url.endswith(".mp4"):
-            duration = get_video_duration(url)
-        elif url.endswith(".m3u8"):
-            # Try to get duration from m3u8 playlist
-            try:
-                r = requests.get(url)
-                m = m3u8.loads(r.text)
-                duration = sum([seg.duration for seg in m.segments]) if m.segments else None
-            except:
-                pass
-        videos_info.append((idx, url, duration))
+    # Gather info for user, probing all candidates concurrently
+    playlists = {}
+    with ThreadPoolExecutor(max_workers=PROBE_WORKERS) as executor:
+        durations = list(executor.map(lambda url: probe_duration(url, playlists), video_urls))
+    videos_info = [(idx, url, duration)
+                   for idx, (url, duration) in enumerate(zip(video_urls, durations), 1)]
 
     # Show list to user
     print("\nAvailable videos found:")
@@ -189,14 +543,18 @@ if __name__ == "__main__":
     selection = input("\nEnter the number of the video to download (comma separated for multiple): ")
     selected_indices = set(int(s.strip()) for s in selection.split(",") if s.strip().isdigit())
 
-    for idx, url, _ in videos_info:
-        if idx in selected_indices:
-            if url.endswith(".m3u8"):
-                title = page_title or f"video_{idx}"
-                download_m3u8(url, f"{title}.mp4")
-            else:
-                parsed = urlparse(url)
-                filename = unquote(Path(parsed.path).name)
-                if filename.lower() in ("video.mp4", "file.mp4", ""):
-                    filename = page_title or f"video_{idx}.mp4"
-                download_with_requests(url, filename=filename)
+    # Remuxes run in the background so the next selection can start downloading right away
+    with ThreadPoolExecutor() as remux_executor:
+        for idx, url, _ in videos_info:
+            if idx in selected_indices:
+                if url.endswith(".m3u8"):
+                    title = page_title or f"video_{idx}"
+                    download_m3u8(url, f"{title}.mp4", playlist=playlists.get(url),
+                                  remux_executor=remux_executor,
+                                  max_bitrate=max_bitrate, max_height=args.max_height)
+                else:
+                    parsed = urlparse(url)
+                    filename = unquote(Path(parsed.path).name)
+                    if filename.lower() in ("video.mp4", "file.mp4", ""):
+                        filename = page_title or f"video_{idx}.mp4"
+                    download_with_requests(url, filename=filename)